@@ -1,13 +1,30 @@
-from flask import Flask, request, jsonify, redirect, url_for, session
+from flask import Flask, Response, request, jsonify, redirect, url_for, session
 import requests
 import json
 import os
 import re
+import sqlite3
+import threading
+import time
+import sys
+import gzip
+import zlib
+import argparse
+import html
+import functools
+from string import Template
+from contextlib import closing
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from collections import deque
 from datetime import datetime, timedelta
-from dotenv import load_dotenv, set_key
+from zoneinfo import ZoneInfo
+from dotenv import load_dotenv
 import google.oauth2.credentials
 import google_auth_oauthlib.flow
 from googleapiclient.discovery import build
+from googleapiclient.errors import HttpError
+from google_auth_httplib2 import AuthorizedHttp
+import httplib2
 from google_auth_oauthlib.flow import InstalledAppFlow
 from google.auth.transport.requests import Request
 from google.oauth2.credentials import Credentials
@@ -20,6 +37,18 @@ import pandas as pd
 from slack_sdk import WebClient
 from slack_sdk.errors import SlackApiError
 
+from transcript_compaction import compact_transcript
+
+try:
+    import ijson  # Optional - lets large transcripts be parsed as a stream
+except ImportError:
+    ijson = None
+
+try:
+    import fcntl  # POSIX only - locks the transcript archive across worker processes
+except ImportError:
+    fcntl = None
+
 os.environ['OAUTHLIB_INSECURE_TRANSPORT'] = '1'
 app = Flask(__name__)
 app.secret_key = os.urandom(24)  # Required for sessions
@@ -32,22 +61,402 @@ if not os.path.exists('.env'):
 # Load environment variables
 load_dotenv()
 
+# Pretty-print full API payloads only when debugging - they can be very large
+DEBUG_PAYLOADS = os.getenv("DEBUG_PAYLOADS", "").lower() in ("1", "true", "yes")
+
+def log_payload(label, payload):
+    """
+    Log a full JSON payload when DEBUG_PAYLOADS is on, otherwise only a short summary
+    """
+    if DEBUG_PAYLOADS or app.debug:
+        print(f"{label}:")
+        print(json.dumps(payload, indent=2))
+    elif isinstance(payload, (list, dict)):
+        print(f"{label}: {type(payload).__name__} with {len(payload)} entries")
+
 SCOPES = [
     'https://www.googleapis.com/auth/calendar',
     'https://www.googleapis.com/auth/gmail.send',
     'https://mail.google.com/'  # More permissive Gmail scope
 ]
 
+MEETSTREAM_API_BASE = 'https://api-meetstream-tst-hackathon.meetstream.ai/api/v1/bots'
+
+
+class ProviderUnavailableError(Exception):
+    """Raised when an outbound call is rejected by a provider's circuit breaker or bulkhead"""
+
+
+class ProviderGuard:
+    """
+    Circuit breaker plus concurrency bulkhead around one outbound provider
+
+    Calls fail fast when the breaker is open or every slot is busy, so a degraded provider
+    cannot tie up all worker threads. After reset_timeout seconds the breaker goes half-open
+    and lets a single probe call through; its outcome closes or re-opens the breaker.
+    """
+
+    def __init__(self, name, max_concurrency, timeout, failure_threshold=5, reset_timeout=30,
+                 is_failure_result=None, is_failure_exception=None):
+        self.name = name
+        self.max_concurrency = int(os.getenv(f"{name.upper()}_MAX_CONCURRENCY", max_concurrency))
+        self.timeout = float(os.getenv(f"{name.upper()}_TIMEOUT", timeout))
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.is_failure_result = is_failure_result
+        self.is_failure_exception = is_failure_exception
+        self.slot_wait = 0  # seconds to wait for a free slot; 0 fails fast
+        self._slots = threading.BoundedSemaphore(self.max_concurrency)
+        self._lock = threading.Lock()
+        self._state = "closed"
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._in_flight = 0
+        self._rejected = 0
+
+    def _before_call(self):
+        with self._lock:
+            if self._state == "open":
+                if time.monotonic() - self._opened_at < self.reset_timeout:
+                    self._rejected += 1
+                    raise ProviderUnavailableError(f"{self.name} circuit is open")
+                self._state = "half_open"
+            if self._state == "half_open":
+                if self._probe_in_flight:
+                    self._rejected += 1
+                    raise ProviderUnavailableError(f"{self.name} circuit is half-open, probe in progress")
+                self._probe_in_flight = True
+                return True
+            return False
+
+    def _record(self, failed, probe):
+        with self._lock:
+            if probe:
+                self._probe_in_flight = False
+            if failed:
+                self._failures += 1
+                if probe or self._failures >= self.failure_threshold:
+                    if self._state != "open":
+                        print(f"Circuit for {self.name} opened after {self._failures} consecutive failures")
+                    self._state = "open"
+                    self._opened_at = time.monotonic()
+            else:
+                if self._state != "closed":
+                    print(f"Circuit for {self.name} closed")
+                self._state = "closed"
+                self._failures = 0
+
+    def acquire(self):
+        """
+        Take a slot for a call whose outcome is reported later with release()
+        Returns a token to pass to release()
+        """
+        probe = self._before_call()
+        acquired = self._slots.acquire(timeout=self.slot_wait) if self.slot_wait else self._slots.acquire(blocking=False)
+        if not acquired:
+            with self._lock:
+                self._rejected += 1
+                if probe:
+                    self._probe_in_flight = False
+            raise ProviderUnavailableError(f"{self.name} is at its concurrency limit ({self.max_concurrency})")
+
+        with self._lock:
+            self._in_flight += 1
+        return probe
+
+    def release(self, probe, failed):
+        """
+        Record the outcome of a call started with acquire() and free its slot
+        """
+        self._record(failed, probe)
+        with self._lock:
+            self._in_flight -= 1
+        self._slots.release()
+
+    def call(self, func, *args, **kwargs):
+        """
+        Run func through the breaker and bulkhead, recording the outcome
+        """
+        probe = self.acquire()
+        try:
+            result = func(*args, **kwargs)
+        except Exception as e:
+            self.release(probe, self.is_failure_exception(e) if self.is_failure_exception else True)
+            raise
+        self.release(probe, bool(self.is_failure_result and self.is_failure_result(result)))
+        return result
+
+    def configure(self, max_concurrency=None, slot_wait=None):
+        """
+        Change the concurrency limit and slot wait, e.g. for a batch process
+        Only call while no calls are in flight
+        """
+        with self._lock:
+            if max_concurrency is not None and max_concurrency != self.max_concurrency:
+                self.max_concurrency = max_concurrency
+                self._slots = threading.BoundedSemaphore(max_concurrency)
+            if slot_wait is not None:
+                self.slot_wait = slot_wait
+
+    def status(self):
+        """
+        Snapshot of the breaker state for the status endpoint
+        """
+        with self._lock:
+            state = self._state
+            if state == "open" and time.monotonic() - self._opened_at >= self.reset_timeout:
+                state = "half_open"
+            return {
+                "state": state,
+                "consecutive_failures": self._failures,
+                "in_flight": self._in_flight,
+                "max_concurrency": self.max_concurrency,
+                "timeout": self.timeout,
+                "rejected": self._rejected,
+            }
+
+
+def _is_outage_status(status_code):
+    return status_code >= 500 or status_code == 429
+
+def _is_slack_outage(error):
+    # Only server-side errors and rate limiting count against the breaker, not e.g. channel_not_found
+    if isinstance(error, SlackApiError):
+        return _is_outage_status(getattr(error.response, 'status_code', 500))
+    return True
+
+def _is_google_outage(error):
+    # A 400 for a bad recipient or a 404 calendar is the caller's problem, not Google's
+    if isinstance(error, HttpError):
+        return _is_outage_status(int(error.resp.status))
+    return isinstance(error, (OSError, httplib2.HttpLib2Error))  # timeouts and connection errors
+
+def _is_groq_outage(error):
+    # e.g. BadRequestError for a prompt that is too long doesn't mean Groq is down
+    if isinstance(error, groq.APIStatusError):
+        return _is_outage_status(error.status_code)
+    return isinstance(error, (groq.APIConnectionError, OSError))  # includes APITimeoutError
+
+
+provider_guards = {
+    "groq": ProviderGuard("groq", max_concurrency=4, timeout=30, is_failure_exception=_is_groq_outage),
+    "gmail": ProviderGuard("gmail", max_concurrency=8, timeout=15, is_failure_exception=_is_google_outage),
+    "slack": ProviderGuard("slack", max_concurrency=8, timeout=10, is_failure_exception=_is_slack_outage),
+    "calendar": ProviderGuard("calendar", max_concurrency=4, timeout=15, is_failure_exception=_is_google_outage),
+    "meetstream": ProviderGuard(
+        "meetstream", max_concurrency=8, timeout=30,
+        is_failure_result=lambda response: _is_outage_status(response.status_code)
+    ),
+}
+
+def meetstream_request(method, url, **kwargs):
+    """
+    Send a request to the MeetStream API through its circuit breaker with the provider timeout
+    """
+    guard = provider_guards["meetstream"]
+    return guard.call(requests.request, method, url, timeout=guard.timeout, **kwargs)
+
+
+class GuardedStream:
+    """
+    A streamed MeetStream response that holds its bulkhead slot until the body has been
+    read and closed, so slow downloads stay inside the concurrency limit and the breaker
+    """
+
+    def __init__(self, guard, probe, response):
+        self.guard = guard
+        self.response = response
+        self._probe = probe
+        self._closed = False
+
+    def close(self, failed=False):
+        if self._closed:
+            return
+        self._closed = True
+        self.response.close()
+        failed = failed or bool(self.guard.is_failure_result and self.guard.is_failure_result(self.response))
+        self.guard.release(self._probe, failed)
+
+def meetstream_stream(method, url, **kwargs):
+    """
+    Open a streamed MeetStream request; the caller must close() the returned GuardedStream
+    """
+    guard = provider_guards["meetstream"]
+    probe = guard.acquire()
+    try:
+        response = requests.request(method, url, timeout=guard.timeout, stream=True, **kwargs)
+    except Exception:
+        guard.release(probe, True)
+        raise
+    return GuardedStream(guard, probe, response)
+
+def build_google_service(api_name, api_version, creds, guard):
+    """
+    Build a Google API client whose HTTP transport uses the provider timeout
+    """
+    http = AuthorizedHttp(creds, http=httplib2.Http(timeout=guard.timeout))
+    return build(api_name, api_version, http=http, cache_discovery=False)
+
 # Initialize Groq client
-groq_client = groq.Client(api_key=os.getenv("GROQ_API_KEY")) if os.getenv("GROQ_API_KEY") else None
+# No SDK retries - they would let one guarded call run for several timeouts; the guard and
+# GROQ_FALLBACK_MODEL decide when to try again
+groq_client = groq.Client(
+    api_key=os.getenv("GROQ_API_KEY"),
+    timeout=provider_guards["groq"].timeout,
+    max_retries=0
+) if os.getenv("GROQ_API_KEY") else None
 
 # Initialize Slack client
 slack_token = os.getenv("SLACK_BOT_TOKEN")
-slack_client = WebClient(token=slack_token) if slack_token else None
+slack_client = WebClient(token=slack_token, timeout=int(provider_guards["slack"].timeout)) if slack_token else None
 
 # Path to contacts CSV file - set this to your CSV file path
 CONTACTS_CSV = os.getenv("CONTACTS_CSV", "contacts.csv")
 
+# Shared state store - BOT_ID, SLACK_BOT_TOKEN, CONTACTS_CSV and the Google token live in a
+# local SQLite database so every worker process (e.g. under gunicorn) sees the same values.
+# .env only seeds the store on first start; after that the store is the source of truth.
+STATE_DB = os.getenv("STATE_DB", os.path.join(os.path.dirname(os.path.abspath(__file__)), 'state.db'))
+SHARED_ENV_KEYS = ("BOT_ID", "SLACK_BOT_TOKEN", "CONTACTS_CSV")
+GOOGLE_TOKEN_KEY = "GOOGLE_TOKEN"
+
+_state_local = threading.local()
+_state_lock = threading.Lock()
+_state_seen_version = -1
+_state_listeners = {}
+
+def _state_db():
+    """
+    Get this thread's connection to the shared state database, creating the schema if needed
+    Connections are also keyed by process id - SQLite connections must not be used across fork(),
+    so a worker forked after import (e.g. gunicorn --preload) opens its own
+    """
+    if getattr(_state_local, 'pid', None) == os.getpid():
+        return _state_local.conn
+
+    conn = sqlite3.connect(STATE_DB, timeout=30, isolation_level=None)
+    conn.execute('PRAGMA journal_mode=WAL')
+    conn.execute('PRAGMA synchronous=NORMAL')
+    conn.execute(
+        'CREATE TABLE IF NOT EXISTS shared_state ('
+        'key TEXT PRIMARY KEY, value BLOB, version INTEGER NOT NULL)'
+    )
+    conn.execute(
+        'CREATE TABLE IF NOT EXISTS shared_state_version ('
+        'id INTEGER PRIMARY KEY CHECK (id = 0), version INTEGER NOT NULL)'
+    )
+    conn.execute('INSERT OR IGNORE INTO shared_state_version (id, version) VALUES (0, 0)')
+    _state_local.conn = conn
+    _state_local.pid = os.getpid()
+    return conn
+
+def get_shared_state(key, default=None):
+    """
+    Read a value from the shared state store
+    """
+    row = _state_db().execute('SELECT value FROM shared_state WHERE key = ?', (key,)).fetchone()
+    return row[0] if row and row[0] is not None else default
+
+def set_shared_state(key, value, only_if_missing=False):
+    """
+    Atomically write a value to the shared state store and bump the global version counter
+    Returns True if the value was written
+    """
+    conn = _state_db()
+    conn.execute('BEGIN IMMEDIATE')
+    try:
+        if only_if_missing and conn.execute('SELECT 1 FROM shared_state WHERE key = ?', (key,)).fetchone():
+            conn.execute('ROLLBACK')
+            return False
+        conn.execute('UPDATE shared_state_version SET version = version + 1 WHERE id = 0')
+        version = conn.execute('SELECT version FROM shared_state_version WHERE id = 0').fetchone()[0]
+        conn.execute(
+            'INSERT INTO shared_state (key, value, version) VALUES (?, ?, ?) '
+            'ON CONFLICT(key) DO UPDATE SET value = excluded.value, version = excluded.version',
+            (key, value, version)
+        )
+        conn.execute('COMMIT')
+        return True
+    except Exception:
+        conn.execute('ROLLBACK')
+        raise
+
+def on_shared_state_change(key):
+    """
+    Decorator registering a callback that is run with the new value whenever a key changes
+    """
+    def register(callback):
+        _state_listeners.setdefault(key, []).append(callback)
+        return callback
+    return register
+
+def refresh_shared_state():
+    """
+    Apply any changes made by other workers since the last refresh
+    Costs a single indexed read when nothing has changed
+    """
+    global _state_seen_version
+    conn = _state_db()
+    version = conn.execute('SELECT version FROM shared_state_version WHERE id = 0').fetchone()[0]
+    if version <= _state_seen_version:
+        return False
+
+    with _state_lock:
+        # Another thread may have applied this version while we waited for the lock
+        if version <= _state_seen_version:
+            return False
+        rows = conn.execute(
+            'SELECT key, value, version FROM shared_state WHERE version > ? ORDER BY version',
+            (_state_seen_version,)
+        ).fetchall()
+        for key, value, row_version in rows:
+            for callback in _state_listeners.get(key, []):
+                try:
+                    callback(value)
+                except Exception as e:
+                    print(f"Error applying shared state change for {key}: {str(e)}")
+            version = max(version, row_version)
+        # Never move the counter backwards, or listeners would run again on the next request
+        _state_seen_version = max(_state_seen_version, version)
+    return True
+
+@on_shared_state_change("BOT_ID")
+def _apply_bot_id(bot_id):
+    os.environ["BOT_ID"] = bot_id
+
+@on_shared_state_change("SLACK_BOT_TOKEN")
+def _apply_slack_token(token):
+    global slack_client
+    os.environ["SLACK_BOT_TOKEN"] = token
+    slack_client = WebClient(token=token, timeout=int(provider_guards["slack"].timeout)) if token else None
+
+@on_shared_state_change("CONTACTS_CSV")
+def _apply_contacts_csv(csv_path):
+    global CONTACTS_CSV
+    os.environ["CONTACTS_CSV"] = csv_path
+    CONTACTS_CSV = csv_path
+
+def seed_shared_state():
+    """
+    Seed the shared state store from .env and token.pickle without overwriting existing values
+    """
+    for key in SHARED_ENV_KEYS:
+        if os.getenv(key):
+            set_shared_state(key, os.getenv(key), only_if_missing=True)
+
+    if os.path.exists('token.pickle'):
+        with open('token.pickle', 'rb') as token:
+            set_shared_state(GOOGLE_TOKEN_KEY, token.read(), only_if_missing=True)
+
+    refresh_shared_state()
+
+seed_shared_state()
+
+@app.before_request
+def _sync_shared_state():
+    refresh_shared_state()
+
 def load_contacts():
     """
     Load contacts from CSV file into a dictionary
@@ -63,7 +472,8 @@ def load_contacts():
             # Convert to dictionary with lowercase names for case-insensitive matching
             for _, row in df.iterrows():
                 name = row['name'].lower()
-                contact_info = {'email': row['email']}
+                # Empty cells come back as NaN - store them as no email rather than a float
+                contact_info = {'email': row['email'] if not pd.isna(row['email']) else None}
                 
                 # Add Slack ID if available
                 if 'slack_id' in df.columns and not pd.isna(row.get('slack_id')):
@@ -120,34 +530,35 @@ def find_contact_by_partial_name(partial_name, contacts):
 def create_bot():
     data = request.get_json()
 
-    external_api_url = 'https://api-meetstream-tst-hackathon.meetstream.ai/api/v1/bots/create_bot'
+    external_api_url = f'{MEETSTREAM_API_BASE}/create_bot'
     
     headers = {
         'Authorization': 'ms_qRTMAkqSin2GmzYL7dWpxGIquSNwWwz1',
         'Content-Type': 'application/json'
     }
 
-    response = requests.post(external_api_url, json=data, headers=headers)
+    try:
+        response = meetstream_request('POST', external_api_url, json=data, headers=headers)
+    except ProviderUnavailableError as e:
+        return jsonify({"error": "MeetStream temporarily unavailable", "details": str(e)}), 503
+    except requests.RequestException as e:
+        return jsonify({"error": "Failed to reach MeetStream", "details": str(e)}), 502
     print("Status Code:", response.status_code)
 
     try:
         json_data = response.json()
-        print("Response JSON:")
-        print(json.dumps(json_data, indent=2))
+        log_payload("Response JSON", json_data)
 
         # Extract bot_id from response
         bot_id = json_data.get("bot_id")
         print("Bot ID from response:", bot_id)
         
         if bot_id:
-            # Use dotenv's set_key function to update BOT_ID
-            dotenv_path = os.path.join(os.path.dirname(__file__), '.env')
-            set_key(dotenv_path, "BOT_ID", bot_id)
-            
-            # Also update in current environment
-            os.environ["BOT_ID"] = bot_id
+            # Store BOT_ID in the shared state so every worker picks it up
+            set_shared_state("BOT_ID", bot_id)
+            refresh_shared_state()
             
-            print(f"Updated bot_id to {bot_id} in .env file")
+            print(f"Updated bot_id to {bot_id} in shared state")
         else:
             print("Warning: No bot_id found in response")
 
@@ -158,18 +569,237 @@ def create_bot():
         return jsonify({"error": "Invalid JSON response", "text": response.text}), 500
 
 
+_archive_write_lock = threading.Lock()
+
+# Transcript archive - every fetched transcript and its extraction result is appended to a
+# gzip file (one gzip member per meeting) with a SQLite index by bot id and time, so past
+# meetings can be re-analysed after the bot is removed.
+TRANSCRIPT_ARCHIVE_DIR = os.getenv(
+    "TRANSCRIPT_ARCHIVE_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'transcript_archive')
+)
+
+def _archive_paths():
+    os.makedirs(TRANSCRIPT_ARCHIVE_DIR, exist_ok=True)
+    return (
+        os.path.join(TRANSCRIPT_ARCHIVE_DIR, 'transcripts.jsonl.gz'),
+        os.path.join(TRANSCRIPT_ARCHIVE_DIR, 'index.db'),
+    )
+
+def _archive_index(index_path):
+    conn = sqlite3.connect(index_path, timeout=30)
+    conn.execute(
+        'CREATE TABLE IF NOT EXISTS transcripts ('
+        'id INTEGER PRIMARY KEY AUTOINCREMENT, bot_id TEXT, archived_at TEXT NOT NULL, '
+        'offset INTEGER NOT NULL, length INTEGER NOT NULL, segments INTEGER NOT NULL)'
+    )
+    conn.execute('CREATE INDEX IF NOT EXISTS transcripts_bot_time ON transcripts (bot_id, archived_at)')
+    conn.execute('CREATE INDEX IF NOT EXISTS transcripts_time ON transcripts (archived_at)')
+    return conn
+
+def archive_transcript(bot_id, segment_json, processing_results):
+    """
+    Append a transcript and its processing results to the compressed archive
+    segment_json is an iterable of JSON-encoded transcript segments, compressed as it is read
+    Returns the archive id of the new entry
+    """
+    data_path, index_path = _archive_paths()
+    archived_at = datetime.now().isoformat()
+
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)  # wbits=31 writes a gzip member
+    header = json.dumps({"bot_id": bot_id, "archived_at": archived_at})
+    parts = [compressor.compress(f'{header[:-1]}, "transcript": ['.encode())]
+    segment_count = 0
+    for chunk in segment_json:
+        parts.append(compressor.compress(((', ' if segment_count else '') + chunk).encode()))
+        segment_count += 1
+    trailer = json.dumps({"processing_results": processing_results})
+    parts.append(compressor.compress(f'], {trailer[1:]}\n'.encode()))
+    parts.append(compressor.flush())
+    blob = b''.join(parts)
+
+    # Lock so appends from several workers never interleave (across processes only where fcntl exists)
+    with _archive_write_lock, open(data_path, 'ab') as archive_file:
+        if fcntl:
+            fcntl.flock(archive_file, fcntl.LOCK_EX)
+        try:
+            archive_file.seek(0, os.SEEK_END)
+            offset = archive_file.tell()
+            archive_file.write(blob)
+            archive_file.flush()
+            os.fsync(archive_file.fileno())
+            with closing(_archive_index(index_path)) as conn, conn:
+                cursor = conn.execute(
+                    'INSERT INTO transcripts (bot_id, archived_at, offset, length, segments) '
+                    'VALUES (?, ?, ?, ?, ?)',
+                    (bot_id, archived_at, offset, len(blob), segment_count)
+                )
+                archive_id = cursor.lastrowid
+        finally:
+            if fcntl:
+                fcntl.flock(archive_file, fcntl.LOCK_UN)
+
+    print(f"Archived transcript for bot {bot_id} ({segment_count} segments, {len(blob)} bytes) as #{archive_id}")
+    return archive_id
+
+def list_archived_transcripts(bot_id=None, since=None, until=None, limit=None):
+    """
+    List archive index entries, oldest first, optionally filtered by bot id and time range
+    """
+    _, index_path = _archive_paths()
+    query = 'SELECT id, bot_id, archived_at, offset, length, segments FROM transcripts WHERE 1 = 1'
+    params = []
+    if bot_id:
+        query += ' AND bot_id = ?'
+        params.append(bot_id)
+    if since:
+        query += ' AND archived_at >= ?'
+        params.append(since)
+    if until:
+        query += ' AND archived_at < ?'
+        params.append(until)
+    query += ' ORDER BY archived_at'
+    if limit:
+        query += ' LIMIT ?'
+        params.append(int(limit))
+
+    columns = ("id", "bot_id", "archived_at", "offset", "length", "segments")
+    with closing(_archive_index(index_path)) as conn:
+        return [dict(zip(columns, row)) for row in conn.execute(query, params)]
+
+def load_archived_transcript(entry):
+    """
+    Read one archived meeting back from the archive using its index entry
+    """
+    data_path, _ = _archive_paths()
+    with open(data_path, 'rb') as archive_file:
+        archive_file.seek(entry["offset"])
+        blob = archive_file.read(entry["length"])
+    return json.loads(gzip.decompress(blob))
+
+def replay_archived_transcripts(entries, workers=None, dry_run=True):
+    """
+    Re-run extraction over archived meetings in parallel
+    Yields one result dict per meeting as soon as it finishes
+    Meant for the replay command's own process - it raises the Groq bulkhead limit to fit the
+    workers and makes calls wait for a free slot instead of failing fast
+    """
+    # Split extraction makes two concurrent calls per meeting
+    calls_per_meeting = 2 if GROQ_SPLIT_EXTRACTION else 1
+    groq_guard = provider_guards["groq"]
+    workers = workers or max(1, groq_guard.max_concurrency // calls_per_meeting)
+    groq_guard.configure(
+        max_concurrency=max(groq_guard.max_concurrency, workers * calls_per_meeting),
+        slot_wait=groq_guard.timeout
+    )
+
+    def replay_one(entry):
+        record = load_archived_transcript(entry)
+        sink = DryRunNotificationSink() if dry_run else LiveNotificationSink()
+        replayed = process_transcript_with_groq(record["transcript"], sink=sink)
+        return {
+            "id": entry["id"],
+            "bot_id": record["bot_id"],
+            "archived_at": record["archived_at"],
+            "original": record.get("processing_results"),
+            "replayed": replayed,
+            "notifications": sink.sent if dry_run else None,
+        }
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(replay_one, entry): entry for entry in entries}
+        for future in as_completed(futures):
+            try:
+                yield future.result()
+            except Exception as e:
+                yield {"id": futures[future]["id"], "error": str(e)}
+
+def replay_command(argv):
+    """
+    Command line entry point: python meeting.py replay [options]
+    """
+    parser = argparse.ArgumentParser(prog="meeting.py replay", description="Re-run extraction over archived transcripts")
+    parser.add_argument("--bot-id", help="Only replay meetings from this bot")
+    parser.add_argument("--since", help="Only replay meetings archived at or after this ISO time")
+    parser.add_argument("--until", help="Only replay meetings archived before this ISO time")
+    parser.add_argument("--limit", type=int, help="Maximum number of meetings to replay")
+    parser.add_argument("--workers", type=int, help="Number of parallel workers (default: derived from GROQ_MAX_CONCURRENCY)")
+    parser.add_argument("--live", action="store_true", help="Actually send notifications instead of a dry run")
+    parser.add_argument("--output", help="Write one JSON result per line to this file instead of stdout")
+    args = parser.parse_args(argv)
+
+    if not groq_client:
+        print("Error: GROQ_API_KEY is not set - nothing to replay with")
+        return 1
+
+    entries = list_archived_transcripts(args.bot_id, args.since, args.until, args.limit)
+    print(f"Replaying {len(entries)} archived meetings ({'live' if args.live else 'dry run'})")
+
+    output = open(args.output, 'w') if args.output else sys.stdout
+    failed = 0
+    try:
+        for result in replay_archived_transcripts(entries, workers=args.workers, dry_run=not args.live):
+            if result.get("error") or (result.get("replayed") or {}).get("error"):
+                failed += 1
+            output.write(json.dumps(result) + "\n")
+    finally:
+        if output is not sys.stdout:
+            output.close()
+
+    print(f"Replay finished: {len(entries) - failed} succeeded, {failed} failed")
+    return 1 if failed else 0
+
+
+TRANSCRIPT_PARSE_ERRORS = (ValueError, ijson.JSONError) if ijson else (ValueError,)
+
+class _PrefixedReader:
+    # File-like object that replays bytes already read from a stream before the rest of it
+    def __init__(self, prefix, stream):
+        self.prefix = prefix
+        self.stream = stream
+
+    def read(self, size=-1):
+        if self.prefix:
+            data = self.prefix if size < 0 else self.prefix[:size]
+            self.prefix = self.prefix[len(data):]
+            return data
+        return self.stream.read(size)
+
+def iter_transcript_segments(response):
+    """
+    Yield transcript segments from a streamed MeetStream response
+    Uses ijson to parse the body incrementally when it is installed
+    Raises ValueError if the body is not a JSON array of segments
+    """
+    if ijson is None:
+        transcript_data = response.json()
+        if not isinstance(transcript_data, list):
+            raise ValueError(f"Expected a JSON array of transcript segments, got {type(transcript_data).__name__}")
+        yield from transcript_data
+        return
+
+    # Peek at the first non-whitespace byte to check the body is an array before streaming it
+    response.raw.decode_content = True
+    prefix = b''
+    while True:
+        chunk = response.raw.read(1024)
+        prefix += chunk
+        if not chunk or prefix.lstrip():
+            break
+    if prefix.lstrip()[:1] != b'[':
+        raise ValueError("Expected a JSON array of transcript segments")
+    yield from ijson.items(_PrefixedReader(prefix, response.raw), 'item', use_float=True)
+
+
 @app.route('/fetch_transcript', methods=['GET'])
 def fetch_transcript():
-    # Reload from .env to get latest BOT_ID
-    load_dotenv()
-    
-    # Get bot_id from .env file
-    bot_id = os.getenv('BOT_ID')
+    # Get the latest bot_id from the shared state
+    bot_id = get_shared_state('BOT_ID')
     
     if not bot_id:
-        return jsonify({"error": "No bot ID found in .env file. Create a bot first."}), 400
+        return jsonify({"error": "No bot ID found. Create a bot first."}), 400
 
-    transcript_api_url = f'https://api-meetstream-tst-hackathon.meetstream.ai/api/v1/bots/{bot_id}/get_transcript'
+    transcript_api_url = f'{MEETSTREAM_API_BASE}/{bot_id}/get_transcript'
     print(f"Using bot_id: {bot_id}")
     print(f"Requesting transcript from: {transcript_api_url}")
 
@@ -178,38 +808,92 @@ def fetch_transcript():
         'Content-Type': 'application/json'
     }
 
-    response = requests.get(transcript_api_url, headers=headers)
+    try:
+        stream = meetstream_stream('GET', transcript_api_url, headers=headers)
+    except ProviderUnavailableError as e:
+        return jsonify({"error": "MeetStream temporarily unavailable", "details": str(e)}), 503
+    except requests.RequestException as e:
+        return jsonify({"error": "Failed to reach MeetStream", "details": str(e)}), 502
+    response = stream.response
     print("Transcript Status Code:", response.status_code)
 
-    try:
-        transcript_data = response.json()
-        print("Transcript JSON:")
-        print(json.dumps(transcript_data, indent=2))
-        
-        # Process transcript for scheduling intents and task assignments using Groq AI
-        processing_results = process_transcript_with_groq(transcript_data)
-        
-        # Return transcript data along with processing results
+    if not response.ok:
+        details = response.text
+        stream.close()
+        print("Transcript request failed:", details)
         return jsonify({
-            "transcript": transcript_data,
-            "processing_results": processing_results,
-            "has_google_credentials": os.path.exists('token.pickle'),
-            "has_slack_integration": bool(slack_client),
+            "error": "Failed to fetch transcript",
+            "status_code": response.status_code,
+            "details": details
         }), response.status_code
-    except ValueError:
-        print("Non-JSON response:", response.text)
-        return jsonify({"error": "Invalid JSON response", "text": response.text}), 500
+
+    # Each segment is kept once, as a compact JSON string, until it is written to the client
+    transcript_chunks = deque()
+
+    def collect_segments():
+        try:
+            for segment in iter_transcript_segments(response):
+                transcript_chunks.append(json.dumps(segment))
+                if DEBUG_PAYLOADS or app.debug:
+                    print("Transcript segment:", json.dumps(segment, indent=2))
+                yield segment
+        except TRANSCRIPT_PARSE_ERRORS:
+            stream.close()
+            raise
+        except Exception:
+            # Network errors while reading the body count against the breaker
+            stream.close(failed=True)
+            raise
+        # Free the slot as soon as the body is read, before the Groq call
+        stream.close()
+
+    segments = collect_segments()
+    try:
+        # Process transcript for scheduling intents and task assignments using Groq AI
+        processing_results = process_transcript_with_groq(segments)
+        # Read any segments left over if processing stopped early
+        for _ in segments:
+            pass
+    except TRANSCRIPT_PARSE_ERRORS as e:
+        print(f"Invalid JSON in transcript response: {str(e)}")
+        return jsonify({"error": "Invalid JSON response", "text": str(e)}), 500
+    except Exception as e:
+        print(f"Error reading transcript response: {str(e)}")
+        return jsonify({"error": "Failed to read transcript from MeetStream", "details": str(e)}), 502
+    finally:
+        stream.close()
+    print(f"Streamed {len(transcript_chunks)} transcript segments")
+
+    try:
+        archive_transcript(bot_id, transcript_chunks, processing_results)
+    except Exception as e:
+        print(f"Failed to archive transcript: {str(e)}")
+
+    trailer = json.dumps({
+        "processing_results": processing_results,
+        "has_google_credentials": has_google_credentials(),
+        "has_slack_integration": bool(slack_client),
+    })
+
+    def generate():
+        # Return transcript data along with processing results, written segment by segment
+        yield '{"transcript": ['
+        first = True
+        while transcript_chunks:
+            yield ('' if first else ', ') + transcript_chunks.popleft()
+            first = False
+        yield '], ' + trailer[1:]
+
+    return Response(generate(), status=response.status_code, mimetype='application/json')
     
 @app.route('/remove_bot', methods=['GET'])
 def remove_bot():
-    load_dotenv()
-    
-    # Get bot_id from .env file
-    bot_id = os.getenv('BOT_ID')
+    # Get the latest bot_id from the shared state
+    bot_id = get_shared_state('BOT_ID')
     if not bot_id:
-        return jsonify({"error": "No bot ID found in .env file. Create a bot first."}), 400
+        return jsonify({"error": "No bot ID found. Create a bot first."}), 400
     
-    removebot_api_url = f'https://api-meetstream-tst-hackathon.meetstream.ai/api/v1/bots/{bot_id}/remove_bot'
+    removebot_api_url = f'{MEETSTREAM_API_BASE}/{bot_id}/remove_bot'
     print(f"Using bot_id: {bot_id}")
     print(f"Removing bot from: {removebot_api_url}")
 
@@ -219,7 +903,7 @@ def remove_bot():
     }
 
     try:
-        response = requests.get(removebot_api_url, headers=headers)
+        response = meetstream_request('GET', removebot_api_url, headers=headers)
         print("Transcript Status Code:", response.status_code)
 
         if response.status_code == 200:
@@ -231,28 +915,202 @@ def remove_bot():
                 "details": response.text
             }), response.status_code
 
+    except ProviderUnavailableError as e:
+        return jsonify({"error": "MeetStream temporarily unavailable", "details": str(e)}), 503
     except Exception as e:
         return jsonify({"error": "Exception occurred while removing bot", "details": str(e)}), 500
 
 
-def process_transcript_with_groq(transcript_data):
+# Groq extraction settings - set GROQ_SPLIT_EXTRACTION to run scheduling and task extraction
+# as two smaller concurrent calls instead of one combined prompt
+GROQ_MODEL = os.getenv("GROQ_MODEL", "gemma2-9b-it")
+GROQ_SCHEDULING_MODEL = os.getenv("GROQ_SCHEDULING_MODEL", GROQ_MODEL)
+GROQ_TASK_MODEL = os.getenv("GROQ_TASK_MODEL", GROQ_MODEL)
+GROQ_FALLBACK_MODEL = os.getenv("GROQ_FALLBACK_MODEL")
+GROQ_SPLIT_EXTRACTION = os.getenv("GROQ_SPLIT_EXTRACTION", "").lower() in ("1", "true", "yes")
+
+def groq_json_completion(prompt, model):
+    """
+    Send a prompt to Groq and parse the JSON object it returns
+    Retries once with GROQ_FALLBACK_MODEL if it is set and the first model fails
+    """
+    models = [model] + ([GROQ_FALLBACK_MODEL] if GROQ_FALLBACK_MODEL and GROQ_FALLBACK_MODEL != model else [])
+    for attempt, current_model in enumerate(models):
+        try:
+            chat_completion = provider_guards["groq"].call(
+                groq_client.chat.completions.create,
+                messages=[{"role": "user", "content": prompt}],
+                model=current_model,
+                response_format={"type": "json_object"},
+                temperature=0.3
+            )
+            return json.loads(chat_completion.choices[0].message.content)
+        except ProviderUnavailableError:
+            raise
+        except Exception as e:
+            if attempt == len(models) - 1:
+                raise
+            print(f"Groq call with {current_model} failed ({str(e)}), retrying with {models[attempt + 1]}")
+
+def _scheduling_prompt(full_transcript):
+    return f"""
+    Analyze the following meeting transcript and extract any scheduling-related information.
+
+    Your response should be in JSON format with the following structure:
+    {{
+        "scheduling_intent": boolean,
+        "event_title": string or null,
+        "start_time": string (ISO format) or null,
+        "end_time": string (ISO format) or null,
+        "attendees": list of email addresses or empty list,
+        "location": string or null,
+        "notes": string or null,
+        "additional_events": list of objects with event_title, start_time, end_time, attendees, location and notes, or empty list
+    }}
+    
+    Rules:
+    1. Only set scheduling_intent to true if there's a clear intent to schedule a meeting
+    2. For times, use the current date if only time is mentioned without a date
+    3. Infer duration as 30 minutes if not specified
+    4. If more than one meeting is being scheduled, put the first one in the top-level fields and the rest in additional_events
+    
+    Transcript:
+    {full_transcript}
+    """
+
+def _task_prompt(full_transcript):
+    return f"""
+    Analyze the following meeting transcript and extract any task assignments to specific people.
+
+    Your response should be in JSON format with the following structure:
+    {{
+        "task_assignments": [
+            {{
+                "assignee": string (person name),
+                "task": string,
+                "due_date": string (ISO format) or null
+            }}
+        ]
+    }}
+    
+    Rules:
+    1. Extract any mentions of tasks being assigned to specific people
+    2. Extract names of people who are being assigned tasks, including nicknames or partial names
+    3. Use an empty list if no tasks were assigned
+    
+    Transcript:
+    {full_transcript}
+    """
+
+def extract_with_split_calls(full_transcript):
+    """
+    Run scheduling and task extraction as two concurrent Groq calls and merge their results
+    Each half fails independently; returns tuple of (merged_response, errors)
+    """
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        scheduling_future = executor.submit(groq_json_completion, _scheduling_prompt(full_transcript), GROQ_SCHEDULING_MODEL)
+        task_future = executor.submit(groq_json_completion, _task_prompt(full_transcript), GROQ_TASK_MODEL)
+
+    response = {"scheduling_intent": False, "task_assignments": []}
+    errors = {}
+    try:
+        scheduling = scheduling_future.result()
+        response.update({key: value for key, value in scheduling.items() if key != "task_assignments"})
+    except Exception as e:
+        print(f"Scheduling extraction failed: {str(e)}")
+        errors["scheduling"] = str(e)
+    try:
+        response["task_assignments"] = task_future.result().get("task_assignments") or []
+    except Exception as e:
+        print(f"Task extraction failed: {str(e)}")
+        errors["tasks"] = str(e)
+
+    if len(errors) == 2:
+        raise RuntimeError(f"Both extraction calls failed: {errors}")
+    return response, errors
+
+
+class LiveNotificationSink:
+    """Sends calendar events, emails and Slack messages for real"""
+    dry_run = False
+
+    def can_use_google(self):
+        return get_google_credentials() is not None
+
+    def can_use_slack(self):
+        return bool(slack_client)
+
+    def create_calendar_events(self, events):
+        return create_calendar_events(events)
+
+    def send_task_email(self, **message):
+        return send_task_email(**message)
+
+    def send_slack_message(self, **message):
+        return send_slack_message(**message)
+
+
+class DryRunNotificationSink(LiveNotificationSink):
+    """Records the notifications that would have been sent instead of sending them"""
+    dry_run = True
+
+    def __init__(self):
+        self.sent = []
+
+    def can_use_google(self):
+        return True
+
+    def can_use_slack(self):
+        return True
+
+    def _record(self, kind, details):
+        # Rendered payloads are left out - the base64 email body isn't useful in replay output
+        self.sent.append({"type": kind, **{
+            key: value.isoformat() if isinstance(value, datetime) else value
+            for key, value in details.items() if key != "payload"
+        }})
+        return True
+
+    def create_calendar_events(self, events):
+        for event in events:
+            self._record("calendar_event", event)
+        return [{
+            "summary": event["summary"],
+            "start_time": event["start_time"].isoformat(),
+            "end_time": event["end_time"].isoformat(),
+            "shifted": False,
+            "created": True,
+        } for event in events]
+
+    def send_task_email(self, **message):
+        return self._record("email", message)
+
+    def send_slack_message(self, **message):
+        return self._record("slack", message)
+
+
+def process_transcript_with_groq(transcript_data, sink=None, split=None):
     """
     Process transcript using Groq AI to detect scheduling intents and task assignments
+    Notifications go through sink, which defaults to actually sending them
+    split runs scheduling and task extraction as separate concurrent calls (default: GROQ_SPLIT_EXTRACTION)
     """
+    sink = sink or LiveNotificationSink()
+    split = GROQ_SPLIT_EXTRACTION if split is None else split
     if not groq_client:
         print("Groq client not initialized - skipping AI processing")
         return
         
-    # Combine all transcript segments into a single text
-    full_transcript = " ".join(
-        segment.get("transcript", "") 
-        for segment in transcript_data 
-        if isinstance(segment, dict)
+    # Compact the transcript segments into a token-budgeted prompt text
+    full_transcript, compaction_stats = compact_transcript(transcript_data)
+    print(
+        f"Compacted transcript from {compaction_stats['tokens_before']} to "
+        f"{compaction_stats['tokens_after']} estimated tokens"
     )
     
     print(f"Processing transcript with Groq AI: {full_transcript[:200]}...")
     
-    # Create a prompt for the AI to analyze the transcript
+    # Create a prompt for the AI to analyze the transcript (used when not splitting)
     prompt = f"""
     Analyze the following meeting transcript and extract:
     1. Any scheduling-related information
@@ -267,6 +1125,7 @@ def process_transcript_with_groq(transcript_data):
         "attendees": list of email addresses or empty list,
         "location": string or null,
         "notes": string or null,
+        "additional_events": list of objects with event_title, start_time, end_time, attendees, location and notes, or empty list,
         "task_assignments": [
             {{
                 "assignee": string (person name),
@@ -282,51 +1141,65 @@ def process_transcript_with_groq(transcript_data):
     3. Infer duration as 30 minutes if not specified
     4. Extract any mentions of tasks being assigned to specific people
     5. Extract names of people who are being assigned tasks, including nicknames or partial names
+    6. If more than one meeting is being scheduled, put the first one in the top-level fields and the rest in additional_events
     
     Transcript:
     {full_transcript}
     """
     
     try:
-        # Call Groq API
-        chat_completion = groq_client.chat.completions.create(
-            messages=[{"role": "user", "content": prompt}],
-            model="gemma2-9b-it",
-            response_format={"type": "json_object"},
-            temperature=0.3
-        )
-        
-        # Parse the response
-        response = json.loads(chat_completion.choices[0].message.content)
-        print("Groq AI Response:", json.dumps(response, indent=2))
+        # Call Groq API and parse the response
+        extraction_errors = {}
+        if split:
+            response, extraction_errors = extract_with_split_calls(full_transcript)
+        else:
+            response = groq_json_completion(prompt, GROQ_MODEL)
+        log_payload("Groq AI Response", response)
         
         results = {
             "scheduled_event": False,
-            "assigned_tasks": []
+            "assigned_tasks": [],
+            "transcript_compaction": compaction_stats
         }
+        if extraction_errors:
+            results["extraction_errors"] = extraction_errors
         
         # Handle scheduling intent
         if response.get("scheduling_intent"):
             try:
-                # Get credentials but don't fail if not available
-                creds = get_google_credentials()
-                if not creds:
+                # Check credentials but don't fail if not available
+                if not sink.can_use_google():
                     print("Warning: No valid Google credentials found. Calendar event cannot be created.")
                     print("Please visit /authorize_google to authorize access to Google Calendar")
                 else:
-                    # Only try to create calendar event if we have valid credentials
-                    event_created = create_calendar_event(
-                        summary=response.get("event_title", "Meeting from transcript"),
-                        description=f"Automatically scheduled from transcript. Notes: {response.get('notes', '')}",
-                        start_time=datetime.fromisoformat(response["start_time"]),
-                        end_time=datetime.fromisoformat(response["end_time"]),
-                        attendees=response.get("attendees", []),
-                        location=response.get("location")
-                    )
+                    # Only try to create calendar events if we have valid credentials
+                    events = []
+                    for intent in [response] + list(response.get("additional_events") or []):
+                        try:
+                            start_time = datetime.fromisoformat(intent["start_time"])
+                            end_time = (
+                                datetime.fromisoformat(intent["end_time"]) if intent.get("end_time")
+                                else start_time + timedelta(minutes=30)
+                            )
+                        except (KeyError, TypeError, ValueError) as e:
+                            print(f"Skipping scheduling intent without a valid time: {str(e)}")
+                            continue
+                        events.append({
+                            "summary": intent.get("event_title") or "Meeting from transcript",
+                            "description": f"Automatically scheduled from transcript. Notes: {intent.get('notes') or ''}",
+                            "start_time": start_time,
+                            "end_time": end_time,
+                            "attendees": intent.get("attendees") or [],
+                            "location": intent.get("location"),
+                        })
+                    
+                    # All events go to the calendar in one batch
+                    created_events = sink.create_calendar_events(events) if events else []
+                    results["scheduled_events"] = created_events
                     
-                    if event_created:
+                    if any(event["created"] for event in created_events):
                         results["scheduled_event"] = True
-                        print("Successfully created calendar event from AI analysis")
+                        print("Successfully created calendar events from AI analysis")
                     else:
                         print("Failed to create calendar event")
             except Exception as e:
@@ -336,7 +1209,28 @@ def process_transcript_with_groq(transcript_data):
         if task_assignments := response.get("task_assignments", []):
             # Load contacts from your existing CSV file
             contacts = load_contacts()
+            
+            # Resolve every assignee first so the whole batch can be rendered in one pass
+            resolved = []
             for assignment in task_assignments:
+                assignee_partial_name = assignment.get("assignee", "").lower()
+                if assignee_partial_name and assignment.get("task"):
+                    # Find the contact using partial name matching
+                    resolved.append(find_contact_by_partial_name(assignee_partial_name, contacts))
+                else:
+                    resolved.append((None, None))
+            payloads = render_task_notifications([
+                {
+                    "recipient_name": full_name,
+                    "recipient_email": contact_info.get('email'),
+                    "slack_id": contact_info.get('slack_id'),
+                    "task": assignment.get("task", ""),
+                    "due_date": assignment.get("due_date"),
+                } if contact_info else None
+                for assignment, (full_name, contact_info) in zip(task_assignments, resolved)
+            ])
+            
+            for assignment, (full_name, contact_info), payload in zip(task_assignments, resolved, payloads):
                 assignee_partial_name = assignment.get("assignee", "").lower()
                 task = assignment.get("task", "")
                 due_date = assignment.get("due_date")
@@ -349,21 +1243,18 @@ def process_transcript_with_groq(transcript_data):
                 }
                 
                 if assignee_partial_name and task:
-                    # Find the contact using partial name matching
-                    full_name, contact_info = find_contact_by_partial_name(assignee_partial_name, contacts)
-                    
                     if contact_info:
                         # Send task via email if we have valid credentials
                         email = contact_info.get('email')
                         if email:
-                            creds = get_google_credentials()
-                            if creds:
+                            if sink.can_use_google():
                                 try:
-                                    email_sent = send_task_email(
+                                    email_sent = sink.send_task_email(
                                         recipient_name=full_name,
                                         recipient_email=email,
                                         task=task,
-                                        due_date=due_date
+                                        due_date=due_date,
+                                        payload=payload.get("email")
                                     )
                                     task_result["email_sent"] = email_sent
                                     if email_sent:
@@ -375,13 +1266,14 @@ def process_transcript_with_groq(transcript_data):
                         
                         # Send task via Slack if we have Slack ID - this is independent of Google credentials
                         slack_id = contact_info.get('slack_id')
-                        if slack_id and slack_client:
+                        if slack_id and sink.can_use_slack():
                             try:
-                                slack_sent = send_slack_message(
+                                slack_sent = sink.send_slack_message(
                                     slack_id=slack_id,
                                     recipient_name=full_name,
                                     task=task,
-                                    due_date=due_date
+                                    due_date=due_date,
+                                    payload=payload.get("slack")
                                 )
                                 task_result["slack_sent"] = slack_sent
                                 if slack_sent:
@@ -405,56 +1297,51 @@ def process_transcript_with_groq(transcript_data):
         return {"error": str(e)}
 
 
-def send_slack_message(slack_id, recipient_name, task, due_date=None):
-    """
-    Send a Slack message to assign a task to someone
+# Notification templates - compiled once at startup. Custom templates can be supplied with
+# EMAIL_TEMPLATE_FILE (HTML) and SLACK_TEMPLATE_FILE (JSON list of Slack blocks), using the
+# placeholders $recipient_name, $task and $due_date.
+DEFAULT_EMAIL_TEMPLATE = """
+    <html>
+      <body>
+        <p>Hi $recipient_name,</p>
+        <p>You've been assigned the following task:</p>
+        <div style="padding: 10px; background-color: #f0f0f0; border-left: 4px solid #2196F3;">
+          <p><strong>$task</strong></p>
+          $due_date
+        </div>
+        <p>This task was automatically assigned based on a meeting transcript.</p>
+        <p>Best regards,<br>MeetStream Assistant</p>
+      </body>
+    </html>
     """
-    if not slack_client:
-        print("No valid Slack client found")
-        return False
-    
-    # Format the due date if provided
-    due_date_str = ""
-    if due_date:
-        try:
-            due_date_dt = datetime.fromisoformat(due_date)
-            due_date_str = f"Due date: {due_date_dt.strftime('%A, %B %d, %Y')}"
-        except:
-            due_date_str = f"Due date: {due_date}"
-    
-    # Create the Slack message blocks
-    blocks = [
-        {
-            "type": "section",
-            "text": {
-                "type": "mrkdwn",
-                "text": f"Hi {recipient_name.title()}, you've been assigned a new task from a meeting:"
-            }
-        },
-        {
-            "type": "divider"
-        },
-        {
-            "type": "section",
-            "text": {
-                "type": "mrkdwn",
-                "text": f"*Task:* {task}"
-            }
+
+DEFAULT_SLACK_TEMPLATE = [
+    {
+        "type": "section",
+        "text": {
+            "type": "mrkdwn",
+            "text": "Hi $recipient_name, you've been assigned a new task from a meeting:"
         }
-    ]
-    
-    # Add due date block if available
-    if due_date_str:
-        blocks.append({
-            "type": "section",
-            "text": {
-                "type": "mrkdwn",
-                "text": f"*{due_date_str}*"
-            }
-        })
-    
-    # Add footer
-    blocks.append({
+    },
+    {
+        "type": "divider"
+    },
+    {
+        "type": "section",
+        "text": {
+            "type": "mrkdwn",
+            "text": "*Task:* $task"
+        }
+    },
+    {
+        # Dropped when there is no due date
+        "type": "section",
+        "text": {
+            "type": "mrkdwn",
+            "text": "$due_date"
+        }
+    },
+    {
         "type": "context",
         "elements": [
             {
@@ -462,77 +1349,163 @@ def send_slack_message(slack_id, recipient_name, task, due_date=None):
                 "text": "This task was automatically assigned based on a meeting transcript"
             }
         ]
-    })
+    }
+]
+
+def _read_template_file(path):
+    if not path:
+        return None
+    try:
+        with open(path) as template_file:
+            return template_file.read()
+    except OSError as e:
+        print(f"Error loading notification template {path}: {str(e)} - using the default")
+        return None
+
+EMAIL_TEMPLATE = Template(_read_template_file(os.getenv("EMAIL_TEMPLATE_FILE")) or DEFAULT_EMAIL_TEMPLATE)
+def _compile_slack_template(path):
+    # Compiled as JSON text; values are JSON-escaped before substitution. A custom template is
+    # checked once here so a broken file doesn't fail every send.
+    template_text = _read_template_file(path)
+    if template_text:
+        template = Template(template_text)
+        try:
+            if isinstance(json.loads(template.safe_substitute()), list):
+                return template
+            print(f"Error loading notification template {path}: expected a JSON list of blocks - using the default")
+        except ValueError as e:
+            print(f"Error loading notification template {path}: invalid JSON ({str(e)}) - using the default")
+    return Template(json.dumps(DEFAULT_SLACK_TEMPLATE))
+
+SLACK_TEMPLATE = _compile_slack_template(os.getenv("SLACK_TEMPLATE_FILE"))
+
+@functools.lru_cache(maxsize=256)
+def _format_due_date(due_date):
+    try:
+        return f"Due date: {datetime.fromisoformat(due_date).strftime('%A, %B %d, %Y')}"
+    except ValueError:
+        return f"Due date: {due_date}"
+
+def format_due_date(due_date):
+    """
+    Format a due date for notifications - parsed once per distinct value and cached
+    """
+    return _format_due_date(str(due_date)) if due_date else ""
+
+def render_task_email(recipient_name, recipient_email, task, due_date=None):
+    """
+    Render a task email into a ready-to-send Gmail API request body
+    """
+    due_date_str = format_due_date(due_date)
+    body = EMAIL_TEMPLATE.safe_substitute(
+        recipient_name=html.escape(recipient_name.title()),
+        task=html.escape(task),
+        due_date=f"<p>{html.escape(due_date_str)}</p>" if due_date_str else ""
+    )
+
+    message = MIMEMultipart()
+    message['to'] = recipient_email
+    message['subject'] = f"Task Assignment: {task[:50]}{'...' if len(task) > 50 else ''}"
+    message.attach(MIMEText(body, 'html'))
+
+    # Convert message to base64 encoded string
+    return {'raw': base64.urlsafe_b64encode(message.as_bytes()).decode()}
+
+def _is_empty_block(block):
+    text = block.get("text")
+    return isinstance(text, dict) and not text.get("text", "").strip("* ")
+
+def render_task_slack(recipient_name, task, due_date=None):
+    """
+    Render a task Slack message into ready-to-send blocks and fallback text
+    """
+    due_date_str = format_due_date(due_date)
+    values = {
+        "recipient_name": recipient_name.title(),
+        "task": task,
+        "due_date": f"*{due_date_str}*" if due_date_str else "",
+    }
+    rendered = SLACK_TEMPLATE.safe_substitute({key: json.dumps(value)[1:-1] for key, value in values.items()})
+    return {
+        "blocks": [block for block in json.loads(rendered) if not _is_empty_block(block)],
+        "text": f"New task assignment: {task}",  # Fallback text for notifications
+    }
+
+def render_task_notifications(assignments):
+    """
+    Render email and Slack payloads for a batch of assignments in one pass
+    Each assignment is a dict with recipient_name, task, due_date and optionally
+    recipient_email / slack_id, or None to skip it. Returns a list in the same order with
+    'email' and/or 'slack' payloads for each assignment. A payload that fails to render is
+    left out, so only that one notification is lost.
+    """
+    rendered = []
+    for assignment in assignments:
+        payloads = {}
+        if assignment:
+            name, task, due_date = assignment["recipient_name"], assignment["task"], assignment.get("due_date")
+            if assignment.get("recipient_email"):
+                try:
+                    payloads["email"] = render_task_email(name, assignment["recipient_email"], task, due_date)
+                except Exception as e:
+                    print(f"Error rendering task email for {name}: {str(e)}")
+            if assignment.get("slack_id"):
+                try:
+                    payloads["slack"] = render_task_slack(name, task, due_date)
+                except Exception as e:
+                    print(f"Error rendering Slack message for {name}: {str(e)}")
+        rendered.append(payloads)
+    return rendered
+
+
+def send_slack_message(slack_id, recipient_name, task, due_date=None, payload=None):
+    """
+    Send a Slack message to assign a task to someone
+    payload is a pre-rendered message from render_task_slack(); rendered here if not given
+    """
+    if not slack_client:
+        print("No valid Slack client found")
+        return False
+    
+    payload = payload or render_task_slack(recipient_name, task, due_date)
     
     try:
         # Send the message to the user
-        response = slack_client.chat_postMessage(
+        response = provider_guards["slack"].call(
+            slack_client.chat_postMessage,
             channel=slack_id,
-            blocks=blocks,
-            text=f"New task assignment: {task}"  # Fallback text for notifications
+            blocks=payload["blocks"],
+            text=payload["text"]
         )
         print(f"Slack message sent to {recipient_name} (ID: {slack_id}), timestamp: {response['ts']}")
         return True
     except SlackApiError as e:
         print(f"Error sending Slack message: {e.response['error']}")
         return False
+    except ProviderUnavailableError as e:
+        print(f"Slack message to {recipient_name} not sent: {str(e)}")
+        return False
 
 
-def send_task_email(recipient_name, recipient_email, task, due_date=None):
+def send_task_email(recipient_name, recipient_email, task, due_date=None, payload=None):
     """
     Send an email to assign a task to someone
+    payload is a pre-rendered request body from render_task_email(); rendered here if not given
     """
     creds = get_google_credentials()
     if not creds:
         print("No valid Google credentials found")
         return False
     
-    service = build('gmail', 'v1', credentials=creds)
-    
-    # Format the due date if provided
-    due_date_str = ""
-    if due_date:
-        try:
-            due_date_dt = datetime.fromisoformat(due_date)
-            due_date_str = f"Due date: {due_date_dt.strftime('%A, %B %d, %Y')}"
-        except:
-            due_date_str = f"Due date: {due_date}"
-    
-    # Create the email content
-    message = MIMEMultipart()
-    message['to'] = recipient_email
-    message['subject'] = f"Task Assignment: {task[:50]}{'...' if len(task) > 50 else ''}"
-    
-    # Format the email body
-    body = f"""
-    <html>
-      <body>
-        <p>Hi {recipient_name.title()},</p>
-        <p>You've been assigned the following task:</p>
-        <div style="padding: 10px; background-color: #f0f0f0; border-left: 4px solid #2196F3;">
-          <p><strong>{task}</strong></p>
-          {f"<p>{due_date_str}</p>" if due_date_str else ""}
-        </div>
-        <p>This task was automatically assigned based on a meeting transcript.</p>
-        <p>Best regards,<br>MeetStream Assistant</p>
-      </body>
-    </html>
-    """
-    
-    msg = MIMEText(body, 'html')
-    message.attach(msg)
-    
-    # Convert message to base64 encoded string
-    encoded_message = base64.urlsafe_b64encode(message.as_bytes()).decode()
+    gmail_guard = provider_guards["gmail"]
+    service = build_google_service('gmail', 'v1', creds, gmail_guard)
     
     # Create the email send request
-    create_message = {
-        'raw': encoded_message
-    }
+    create_message = payload or render_task_email(recipient_name, recipient_email, task, due_date)
     
     # Actually send the message
     try:
-        sent_message = service.users().messages().send(userId="me", body=create_message).execute()
+        sent_message = gmail_guard.call(service.users().messages().send(userId="me", body=create_message).execute)
         print(f"Email sent to {recipient_email}, Message Id: {sent_message['id']}")
         return True
     except Exception as e:
@@ -540,52 +1513,234 @@ def send_task_email(recipient_name, recipient_email, task, due_date=None):
         return False
 
 
-def create_calendar_event(summary, description, start_time, end_time, attendees=None, location=None):
+# Calendar subsystem - inserts all events from a transcript in one batch request and moves
+# extracted times to the nearest slot where the organizer and every attendee are free.
+# Free/busy comes back as absolute times, so attendee timezones need no per-attendee lookups.
+CALENDAR_TIMEZONE = os.getenv("CALENDAR_TIMEZONE")  # Defaults to the primary calendar's timezone
+DEFAULT_CALENDAR_TIMEZONE = 'America/Los_Angeles'
+CALENDAR_AVOID_CONFLICTS = os.getenv("CALENDAR_AVOID_CONFLICTS", "true").lower() in ("1", "true", "yes")
+CALENDAR_SLOT_STEP = timedelta(minutes=int(os.getenv("CALENDAR_SLOT_STEP_MINUTES", "15")))
+CALENDAR_SLOT_SEARCH = timedelta(hours=int(os.getenv("CALENDAR_SLOT_SEARCH_HOURS", "8")))
+FREEBUSY_CACHE_SECONDS = int(os.getenv("FREEBUSY_CACHE_SECONDS", "60"))
+FREEBUSY_MAX_CALENDARS = 50  # Google's limit per free/busy query
+
+_freebusy_cache = {}  # calendar id -> (fetched_at, time_min, time_max, busy windows)
+_freebusy_lock = threading.Lock()
+_calendar_timezone = None
+
+def get_calendar_timezone(service):
+    """
+    Timezone used for extracted times - CALENDAR_TIMEZONE or the primary calendar's, looked up once
+    """
+    global _calendar_timezone
+    if CALENDAR_TIMEZONE:
+        return CALENDAR_TIMEZONE
+    if _calendar_timezone is None:
+        try:
+            calendar = provider_guards["calendar"].call(service.calendars().get(calendarId='primary').execute)
+            _calendar_timezone = calendar.get('timeZone') or DEFAULT_CALENDAR_TIMEZONE
+        except Exception as e:
+            print(f"Error looking up calendar timezone, using {DEFAULT_CALENDAR_TIMEZONE}: {str(e)}")
+            return DEFAULT_CALENDAR_TIMEZONE
+    return _calendar_timezone
+
+def _parse_google_time(value):
+    return datetime.fromisoformat(value.replace('Z', '+00:00'))
+
+def get_busy_windows(service, calendar_ids, time_min, time_max):
+    """
+    Get busy windows for several calendars, using a single free/busy query for all the ones
+    that are not already cached for the requested range
+    Returns a dict of calendar id -> list of (start, end) tuples, copied so callers can extend them
+    """
+    now = time.monotonic()
+    busy = {}
+    missing = []
+    with _freebusy_lock:
+        for calendar_id in calendar_ids:
+            cached = _freebusy_cache.get(calendar_id)
+            if cached and now - cached[0] < FREEBUSY_CACHE_SECONDS and cached[1] <= time_min and cached[2] >= time_max:
+                busy[calendar_id] = list(cached[3])
+            else:
+                missing.append(calendar_id)
+
+    for index in range(0, len(missing), FREEBUSY_MAX_CALENDARS):
+        chunk = missing[index:index + FREEBUSY_MAX_CALENDARS]
+        body = {
+            "timeMin": time_min.isoformat(),
+            "timeMax": time_max.isoformat(),
+            "items": [{"id": calendar_id} for calendar_id in chunk],
+        }
+        response = provider_guards["calendar"].call(service.freebusy().query(body=body).execute)
+        calendars = response.get("calendars", {})
+        with _freebusy_lock:
+            for calendar_id in chunk:
+                info = calendars.get(calendar_id, {})
+                if info.get("errors"):
+                    # e.g. an external calendar that isn't shared - treat it as free
+                    print(f"No free/busy information for {calendar_id}: {info['errors']}")
+                windows = [
+                    (_parse_google_time(window["start"]), _parse_google_time(window["end"]))
+                    for window in info.get("busy", [])
+                ]
+                busy[calendar_id] = list(windows)
+                _freebusy_cache[calendar_id] = (now, time_min, time_max, windows)
+
+    return busy
+
+def _mark_busy(calendar_ids, start_time, end_time):
+    # Add a just-booked event to the cached windows so later lookups in this worker see it
+    with _freebusy_lock:
+        for calendar_id in calendar_ids:
+            cached = _freebusy_cache.get(calendar_id)
+            if cached:
+                cached[3].append((start_time, end_time))
+
+def find_free_slot(start_time, end_time, busy_windows):
+    """
+    Find the free slot nearest to the requested time, searching later and earlier in
+    CALENDAR_SLOT_STEP increments up to CALENDAR_SLOT_SEARCH away
+    Never moves a meeting into the past; returns the original time if nothing is free
     """
-    Create a Google Calendar event with enhanced details
+    duration = end_time - start_time
+    now = datetime.now(start_time.tzinfo)
+    steps = int(CALENDAR_SLOT_SEARCH / CALENDAR_SLOT_STEP)
+    for step in range(steps + 1):
+        offsets = [timedelta(0)] if step == 0 else [CALENDAR_SLOT_STEP * step, -CALENDAR_SLOT_STEP * step]
+        for offset in offsets:
+            candidate = start_time + offset
+            if offset < timedelta(0) and candidate < now:
+                continue
+            if all(candidate >= busy_end or candidate + duration <= busy_start for busy_start, busy_end in busy_windows):
+                return candidate, candidate + duration
+    return start_time, end_time
+
+def create_calendar_events(events, avoid_conflicts=None):
     """
+    Create several Google Calendar events in one batch request
+    Each event is a dict with summary, description, start_time, end_time and optionally
+    attendees and location. Naive times are taken to be in the calendar's timezone.
+    Returns a list with the final times and whether each event was created, in the same order
+    """
+    avoid_conflicts = CALENDAR_AVOID_CONFLICTS if avoid_conflicts is None else avoid_conflicts
+    failed = [{
+        "summary": event["summary"],
+        "start_time": event["start_time"].isoformat(),
+        "end_time": event["end_time"].isoformat(),
+        "shifted": False,
+        "created": False,
+    } for event in events]
+
     creds = get_google_credentials()
     if not creds:
         print("No valid Google credentials found")
-        return False
+        return failed
     
     try:
-        service = build('calendar', 'v3', credentials=creds)
-        
-        # Format attendees
-        attendee_list = []
-        if attendees:
-            attendee_list = [{'email': email} for email in attendees if '@' in email]
-        
-        # Create event with all available details
-        event = {
-            'summary': summary,
-            'description': description,
-            'start': {
-                'dateTime': start_time.isoformat(),
-                'timeZone': 'America/Los_Angeles',  # Adjust timezone as needed
-            },
-            'end': {
-                'dateTime': end_time.isoformat(),
-                'timeZone': 'America/Los_Angeles',  # Adjust timezone as needed
-            },
-            'reminders': {
-                'useDefault': True,
-            },
-        }
-        
-        if attendee_list:
-            event['attendees'] = attendee_list
-        
-        if location:
-            event['location'] = location
-        
-        event = service.events().insert(calendarId='primary', body=event).execute()
-        print(f'Event created: {event.get("htmlLink")}')
-        return True
+        calendar_guard = provider_guards["calendar"]
+        service = build_google_service('calendar', 'v3', creds, calendar_guard)
+        timezone = get_calendar_timezone(service)
+        zone = ZoneInfo(timezone)
+
+        prepared = []
+        for event in events:
+            start_time, end_time = event["start_time"], event["end_time"]
+            prepared.append({
+                "event": event,
+                "start_time": start_time if start_time.tzinfo else start_time.replace(tzinfo=zone),
+                "end_time": end_time if end_time.tzinfo else end_time.replace(tzinfo=zone),
+                # Format attendees
+                "attendees": sorted({email for email in event.get("attendees") or [] if '@' in email}),
+            })
+
+        shifted = [False] * len(prepared)
+        if avoid_conflicts and prepared:
+            calendar_ids = ['primary'] + sorted({email for item in prepared for email in item["attendees"]})
+            time_min = min(item["start_time"] for item in prepared) - CALENDAR_SLOT_SEARCH
+            time_max = max(item["end_time"] for item in prepared) + CALENDAR_SLOT_SEARCH
+            try:
+                busy = get_busy_windows(service, calendar_ids, time_min, time_max)
+            except Exception as e:
+                print(f"Error querying free/busy, keeping extracted times: {str(e)}")
+                busy = {}
+
+            for index, item in enumerate(prepared):
+                windows = [window for calendar_id in ['primary'] + item["attendees"] for window in busy.get(calendar_id, [])]
+                start_time, end_time = find_free_slot(item["start_time"], item["end_time"], windows)
+                if start_time != item["start_time"]:
+                    print(f"Moved '{item['event']['summary']}' from {item['start_time'].isoformat()} to {start_time.isoformat()} to avoid a conflict")
+                    shifted[index] = True
+                item["start_time"], item["end_time"] = start_time, end_time
+                # Later events in this batch must not overlap the ones already placed
+                busy.setdefault('primary', []).append((start_time, end_time))
+
+        created = [False] * len(prepared)
+
+        def on_insert(request_id, response, exception):
+            index = int(request_id)
+            if exception:
+                print(f"Error creating calendar event: {str(exception)}")
+            else:
+                created[index] = True
+                print(f'Event created: {response.get("htmlLink")}')
+
+        batch = service.new_batch_http_request(callback=on_insert)
+        for index, item in enumerate(prepared):
+            event = item["event"]
+            # Create event with all available details
+            body = {
+                'summary': event["summary"],
+                'description': event["description"],
+                'start': {
+                    'dateTime': item["start_time"].isoformat(),
+                    'timeZone': timezone,
+                },
+                'end': {
+                    'dateTime': item["end_time"].isoformat(),
+                    'timeZone': timezone,
+                },
+                'reminders': {
+                    'useDefault': True,
+                },
+            }
+            
+            if item["attendees"]:
+                body['attendees'] = [{'email': email} for email in item["attendees"]]
+            
+            if event.get("location"):
+                body['location'] = event["location"]
+            
+            batch.add(service.events().insert(calendarId='primary', body=body), request_id=str(index))
+
+        calendar_guard.call(batch.execute)
+        for index, item in enumerate(prepared):
+            if created[index]:
+                _mark_busy(['primary'] + item["attendees"], item["start_time"], item["end_time"])
+        return [{
+            "summary": item["event"]["summary"],
+            "start_time": item["start_time"].isoformat(),
+            "end_time": item["end_time"].isoformat(),
+            "shifted": shifted[index],
+            "created": created[index],
+        } for index, item in enumerate(prepared)]
     except Exception as e:
-        print(f"Error creating calendar event: {str(e)}")
-        return False
+        print(f"Error creating calendar events: {str(e)}")
+        return failed
+
+
+def create_calendar_event(summary, description, start_time, end_time, attendees=None, location=None):
+    """
+    Create a single Google Calendar event with enhanced details
+    """
+    results = create_calendar_events([{
+        "summary": summary,
+        "description": description,
+        "start_time": start_time,
+        "end_time": end_time,
+        "attendees": attendees,
+        "location": location,
+    }])
+    return bool(results and results[0]["created"])
 
 
 def get_google_credentials():
@@ -593,20 +1748,22 @@ def get_google_credentials():
     Get Google API credentials, requesting authorization if needed
     """
     creds = None
-    # Check if token.pickle file exists
-    if os.path.exists('token.pickle'):
-        with open('token.pickle', 'rb') as token:
-            try:
-                creds = pickle.load(token)
-            except Exception as e:
-                print(f"Error loading credentials from token.pickle: {str(e)}")
-                return None
+    # Check if a token is stored in the shared state
+    token = get_shared_state(GOOGLE_TOKEN_KEY)
+    if token:
+        try:
+            creds = pickle.loads(token)
+        except Exception as e:
+            print(f"Error loading stored Google credentials: {str(e)}")
+            return None
             
     # If no valid credentials available, return None
     if not creds or not creds.valid:
         if creds and creds.expired and creds.refresh_token:
             try:
                 creds.refresh(Request())
+                # Share the refreshed token so other workers don't refresh it again
+                set_shared_state(GOOGLE_TOKEN_KEY, pickle.dumps(creds))
             except Exception as e:
                 print(f"Error refreshing credentials: {str(e)}")
                 return None
@@ -616,6 +1773,12 @@ def get_google_credentials():
             
     return creds
 
+def has_google_credentials():
+    """
+    Check whether a Google token has been stored, without loading or refreshing it
+    """
+    return get_shared_state(GOOGLE_TOKEN_KEY) is not None
+
 @app.route('/authorize_google')
 def authorize_google():
     """
@@ -655,8 +1818,7 @@ def oauth2callback():
     
     # Store the credentials for later use
     creds = flow.credentials
-    with open('token.pickle', 'wb') as token:
-        pickle.dump(creds, token)
+    set_shared_state(GOOGLE_TOKEN_KEY, pickle.dumps(creds))
     
     return redirect(url_for('index'))
 
@@ -737,16 +1899,11 @@ def set_slack_token():
         if not token:
             return jsonify({"error": "No Slack token provided"}), 400
         
-        # Update token in .env file
-        dotenv_path = os.path.join(os.path.dirname(__file__), '.env')
-        set_key(dotenv_path, "SLACK_BOT_TOKEN", token)
+        # Update token in the shared state - other workers pick it up on their next request
+        set_shared_state("SLACK_BOT_TOKEN", token)
         
-        # Update in current environment
-        os.environ["SLACK_BOT_TOKEN"] = token
-        
-        # Update the global slack client
-        global slack_client
-        slack_client = WebClient(token=token)
+        # Apply it to this worker's global slack client right away
+        refresh_shared_state()
         
         # Test the token with a simple API call
         try:
@@ -785,12 +1942,9 @@ def set_contacts_csv_path():
         if not os.path.exists(csv_path):
             return jsonify({"error": f"CSV file not found at {csv_path}"}), 404
         
-        # Update path in .env file
-        dotenv_path = os.path.join(os.path.dirname(__file__), '.env')
-        set_key(dotenv_path, "CONTACTS_CSV", csv_path)
-        
-        # Update in current environment
-        os.environ["CONTACTS_CSV"] = csv_path
+        # Update path in the shared state and apply it to this worker
+        set_shared_state("CONTACTS_CSV", csv_path)
+        refresh_shared_state()
         
         # Test loading the contacts
         contacts = load_contacts()
@@ -807,7 +1961,7 @@ def set_contacts_csv_path():
 @app.route('/')
 def index():
     """Simple index page"""
-    has_credentials = os.path.exists('token.pickle')
+    has_credentials = has_google_credentials()
     has_contacts = os.path.exists(CONTACTS_CSV)
     
     return jsonify({
@@ -816,6 +1970,7 @@ def index():
         "google_credentials": "Authorized" if has_credentials else "Not authorized",
         "slack_integration": "Available" if slack_client else "Not configured",
         "groq_ai_available": bool(groq_client),
+        "providers": {name: guard.status() for name, guard in provider_guards.items()},
         "contacts_csv": f"Available at {CONTACTS_CSV}" if has_contacts else f"Not found at {CONTACTS_CSV}",
         "auth_url": url_for('authorize_google', _external=True) if not has_credentials else None,
         "endpoints": {
@@ -831,6 +1986,9 @@ def index():
 
 
 if __name__ == '__main__':
+    if len(sys.argv) > 1 and sys.argv[1] == 'replay':
+        sys.exit(replay_command(sys.argv[2:]))
+
     # Check for API keys
     if not os.getenv("GROQ_API_KEY"):
         print("Warning: GROQ_API_KEY not found in environment variables. AI processing will be disabled.")
@@ -0,0 +1,75 @@
+from transcript_compaction import compact_transcript
+
+
+def compact(*segments, **kwargs):
+    data = [
+        {"speaker": speaker, "transcript": text} if speaker else {"transcript": text}
+        for speaker, text in segments
+    ]
+    return compact_transcript(data, **kwargs)[0]
+
+
+def test_meaningful_phrases_are_not_treated_as_fillers():
+    assert compact(("Alice", "I'll let you know by Friday whether we ship.")) == \
+        "Alice: I'll let you know by Friday whether we ship."
+    assert compact(("Alice", "Do you know who has the deck?")) == "Alice: Do you know who has the deck?"
+    assert compact(("Alice", "I mean the Q3 numbers.")) == "Alice: I mean the Q3 numbers."
+    assert compact(("Alice", "We need 35 mm film.")) == "Alice: We need 35 mm film."
+
+
+def test_hesitations_are_stripped():
+    assert compact(("Alice", "Um, so, uh, we ship it.")) == "Alice: so, we ship it."
+
+
+def test_single_repeated_word_is_kept():
+    assert compact(("Alice", "That that is the plan")) == "Alice: That that is the plan"
+
+
+def test_repeated_phrase_is_collapsed():
+    assert compact(("Alice", "I think I think we should ship")) == "Alice: I think we should ship"
+
+
+def test_reply_to_another_speaker_is_kept():
+    assert compact(("Alice", "Can someone own the budget review?"), ("Bob", "Sure.")) == \
+        "Alice: Can someone own the budget review?\nBob: Sure."
+
+
+def test_back_channel_after_own_line_is_dropped():
+    assert compact(("Bob", "I'll do the review."), ("Bob", "Yeah.")) == "Bob: I'll do the review."
+
+
+def test_same_words_from_another_speaker_are_kept():
+    assert compact(("Alice", "I can take the slides."), ("Bob", "I can take the slides.")) == \
+        "Alice: I can take the slides.\nBob: I can take the slides."
+
+
+def test_short_follow_up_is_not_treated_as_repeat():
+    assert compact(("Alice", "Let's meet at 5"), ("Alice", "5")) == "Alice: Let's meet at 5 5"
+
+
+def test_segments_without_speaker_are_not_merged():
+    assert compact((None, "First point."), (None, "Second point.")) == "First point.\nSecond point."
+
+
+def test_budget_never_empties_the_transcript():
+    segments = [("Alice", f"Segment number {i} talks about the quarterly plan.") for i in range(3000)]
+    text, stats = compact_transcript(
+        [{"speaker": speaker, "transcript": value} for speaker, value in segments], token_budget=500
+    )
+    assert text.endswith("Segment number 2999 talks about the quarterly plan.")
+    assert 0 < stats["tokens_after"] <= 520
+
+    monologue = " ".join(f"point{i}" for i in range(5000))
+    text, stats = compact_transcript([{"speaker": "Alice", "transcript": monologue}], token_budget=50)
+    assert text.startswith("Alice: ... point")
+    assert text.endswith("point4999")
+    assert stats["tokens_after"] <= 50
+
+
+def test_compaction_can_be_turned_off():
+    text, stats = compact_transcript(
+        [{"speaker": "Alice", "transcript": "Um, you know,"}, {"speaker": "Bob", "transcript": "Sure."}],
+        enabled=False,
+    )
+    assert text == "Um, you know, Sure."
+    assert stats["tokens_before"] == stats["tokens_after"]
@@ -0,0 +1,144 @@
+"""
+Transcript compaction - shrinks the prompt before it is sent to Groq
+Kept free of the Flask app and API clients so it can be tested on its own
+"""
+import math
+import os
+import re
+
+# Settings are read when compact_transcript() runs so values loaded from .env apply:
+# TRANSCRIPT_COMPACTION (default true), TRANSCRIPT_TOKEN_BUDGET (6000) and
+# TRANSCRIPT_MAX_LINE_TOKENS (300)
+SPEAKER_KEYS = ("speaker", "speaker_name", "speakerName")
+# Only pure hesitation sounds - phrases like "you know" or "mm" can carry meaning
+FILLER_RE = re.compile(r"\b(?:u+m+|u+h+|uhm|erm|hmm+|ah+)\b[,.]?\s*", re.IGNORECASE)
+# A phrase of two to five words repeated back to back, e.g. "I think I think" - single
+# repeated words are left alone since "that that" is often grammatical
+REPEAT_RE = re.compile(r"\b(\w+(?:\s+\w+){1,4})(?:[\s,]+\1\b)+", re.IGNORECASE)
+BACKCHANNEL_WORDS = {"yeah", "yes", "yep", "okay", "ok", "right", "sure", "cool", "alright", "great", "mhm", "uh-huh"}
+
+def estimate_tokens(text):
+    """
+    Rough token count (about 4 characters per token) used for budgeting prompts
+    """
+    return math.ceil(len(text) / 4)
+
+def _clean_segment_text(text):
+    text = FILLER_RE.sub("", text)
+    text = REPEAT_RE.sub(r"\1", text)
+    text = re.sub(r"\s+", " ", text)
+    text = re.sub(r"\s+([,.?!])", r"\1", text)
+    return re.sub(r"^[,.\s]+", "", text).strip()
+
+def _is_backchannel(text):
+    words = re.findall(r"[\w-]+", text.lower())
+    return bool(words) and all(word in BACKCHANNEL_WORDS for word in words)
+
+def _words(text):
+    return re.findall(r"[\w'-]+", text.lower())
+
+def _format_line(speaker, text):
+    return f"{speaker}: {text}" if speaker else text
+
+def _trim_line_front(speaker, text, token_budget):
+    # Keep the end of an over-long line, cut at a word boundary
+    keep_chars = max(token_budget * 4 - len(_format_line(speaker, "... ")), 0)
+    tail = text[-keep_chars:] if keep_chars else ""
+    if len(tail) < len(text) and " " in tail:
+        tail = tail.split(" ", 1)[1]
+    return f"... {tail}"
+
+def compact_transcript(transcript_data, token_budget=None, enabled=None):
+    """
+    Turn raw transcript segments into a compact "Speaker: text" transcript
+    Strips fillers, collapses repeated fragments, drops back-channel replies and exact repeats
+    from the same speaker, merges consecutive lines from the same speaker (up to
+    TRANSCRIPT_MAX_LINE_TOKENS), and trims the oldest text if the result is still over the
+    token budget. The budget never empties the transcript.
+    With compaction turned off (TRANSCRIPT_COMPACTION=false) the segment text is joined as is.
+    Returns tuple of (compacted_text, stats)
+    """
+    if token_budget is None:
+        token_budget = int(os.getenv("TRANSCRIPT_TOKEN_BUDGET", "6000"))
+    if enabled is None:
+        enabled = os.getenv("TRANSCRIPT_COMPACTION", "true").lower() in ("1", "true", "yes")
+    max_line_tokens = int(os.getenv("TRANSCRIPT_MAX_LINE_TOKENS", "300"))
+
+    raw_parts = []
+    raw_chars = 0
+    segment_count = 0
+    lines = []  # list of [speaker, text]
+    last_words = {}  # speaker -> words of their last kept segment
+    for segment in transcript_data or []:
+        if not isinstance(segment, dict):
+            continue
+        raw_text = segment.get("transcript") or ""
+        raw_chars += len(raw_text) + (1 if segment_count else 0)
+        segment_count += 1
+
+        if not enabled:
+            raw_parts.append(raw_text)
+            continue
+
+        text = _clean_segment_text(raw_text)
+        if not text:
+            continue
+
+        speaker = next((segment[key] for key in SPEAKER_KEYS if segment.get(key)), None)
+        # "Sure." answering someone else says who took the task - only drop a back-channel
+        # reply that follows the same speaker's own line
+        if _is_backchannel(text) and speaker is not None and lines and lines[-1][0] == speaker:
+            continue
+        words = _words(text)
+        if speaker is None:
+            # Without attribution only a back-to-back repeat is known to be a duplicate
+            if lines and lines[-1][0] is None and last_words.get(None) == words:
+                continue
+        elif last_words.get(speaker) == words:
+            continue
+        last_words[speaker] = words
+
+        # Segments without a speaker are never merged - they may come from different people
+        if (speaker is not None and lines and lines[-1][0] == speaker
+                and estimate_tokens(lines[-1][1]) + estimate_tokens(text) <= max_line_tokens):
+            lines[-1][1] = f"{lines[-1][1]} {text}"
+        else:
+            lines.append([speaker, text])
+
+    if not enabled:
+        full_transcript = " ".join(raw_parts)
+        tokens = estimate_tokens(full_transcript)
+        return full_transcript, {
+            "tokens_before": tokens,
+            "tokens_after": tokens,
+            "segments": segment_count,
+            "lines": segment_count,
+            "lines_omitted": 0,
+        }
+
+    # Keep the most recent lines when over budget - action items tend to be recapped at the end
+    kept = list(lines)
+    omitted = 0
+    total_tokens = sum(estimate_tokens(_format_line(speaker, text)) + 1 for speaker, text in kept)
+    while len(kept) > 1 and token_budget and total_tokens > token_budget:
+        speaker, text = kept.pop(0)
+        total_tokens -= estimate_tokens(_format_line(speaker, text)) + 1
+        omitted += 1
+    if kept and token_budget and total_tokens > token_budget:
+        # A single line over budget is shortened from the front rather than dropped
+        speaker, text = kept[0]
+        kept[0] = [speaker, _trim_line_front(speaker, text, token_budget)]
+
+    formatted = [_format_line(speaker, text) for speaker, text in kept]
+    if omitted:
+        formatted.insert(0, f"[... {omitted} earlier lines omitted ...]")
+
+    compacted = "\n".join(formatted)
+    stats = {
+        "tokens_before": math.ceil(raw_chars / 4),
+        "tokens_after": estimate_tokens(compacted),
+        "segments": segment_count,
+        "lines": len(lines),
+        "lines_omitted": omitted,
+    }
+    return compacted, stats